@@ -10,15 +10,27 @@ Provides tools for analyzing your Plex library including:
 import os
 import sys
 import argparse
+import functools
 import logging
 import json
-from typing import List, Set
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Set, TYPE_CHECKING
 from pathlib import Path
 from dotenv import load_dotenv
 from datetime import datetime
 
-from plexapi.server import PlexServer
-from plexapi.video import Movie, Episode
+try:
+    # Optional, several times faster than json for large exports and caches
+    import orjson
+except ImportError:
+    orjson = None
+
+if TYPE_CHECKING:
+    import requests
 
 # Load environment variables
 load_dotenv()
@@ -30,42 +42,315 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Items requested per page when listing a library (plexapi defaults to 100)
+PLEX_CONTAINER_SIZE = 1000
+
+# Rating keys per /library/metadata request when fetching full item details
+PLEX_METADATA_BATCH_SIZE = 100
+
+# Format of cached library scans - bump whenever the way an item record is
+# built changes, so records from older versions are rebuilt instead of reused
+CACHE_VERSION = 1
+
+# ISO 639-2 subtitle language codes (bibliographic and terminology forms)
+# mapped to their two-letter equivalents
+LANGUAGE_CONVERSIONS = {
+    'eng': 'en', 'spa': 'es', 'fra': 'fr', 'fre': 'fr', 'deu': 'de', 'ger': 'de',
+    'ita': 'it', 'por': 'pt', 'nld': 'nl', 'dut': 'nl', 'jpn': 'ja', 'zho': 'zh',
+    'chi': 'zh', 'kor': 'ko', 'rus': 'ru', 'swe': 'sv', 'dan': 'da', 'nor': 'no',
+    'fin': 'fi', 'pol': 'pl', 'ces': 'cs', 'cze': 'cs', 'ell': 'el', 'gre': 'el',
+    'heb': 'he', 'ara': 'ar', 'tur': 'tr', 'hun': 'hu', 'ron': 'ro', 'rum': 'ro',
+    'ukr': 'uk', 'vie': 'vi', 'tha': 'th', 'hin': 'hi', 'ind': 'id', 'msa': 'ms',
+    'may': 'ms',
+}
+
+
+@functools.lru_cache(maxsize=512)
+def _normalize_language_code(lang_code: str) -> str:
+    """Normalize a subtitle language code (cached, there are only a few distinct codes)."""
+    lang_code = lang_code.lower()
+    return LANGUAGE_CONVERSIONS.get(lang_code, lang_code[:2] if len(lang_code) == 3 else lang_code)
+
+
+def _json_dumps(obj) -> bytes:
+    """Serialize to compact UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def _json_loads(data: bytes):
+    """Parse UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _create_session(pool_size: int = 20) -> 'requests.Session':
+    """
+    Create an HTTP session for talking to Plex.
+
+    Connections are kept alive and pooled so repeated and concurrent
+    requests skip the TCP (and TLS) handshake, and transient server errors
+    are retried with backoff.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=pool_size, max_retries=retries)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class _EnvDefault(argparse.Action):
+    """Argparse action that defaults to an environment variable, and is only required when it is unset."""
+
+    def __init__(self, envvar: str, required: bool = True, default=None, **kwargs):
+        default = os.environ.get(envvar) or default
+        super().__init__(default=default, required=required and not default, **kwargs)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        setattr(namespace, self.dest, values)
+
 
 class PlexTools:
     """Tools for analyzing Plex libraries."""
 
-    def __init__(self, plex_url: str, plex_token: str):
+    def __init__(self, plex_url: str, plex_token: str, cache_dir: str = None, cache_max_age: float = 7,
+                 session: 'requests.Session' = None):
         """
         Initialize Plex Tools.
 
         Args:
             plex_url: Plex server URL
             plex_token: Plex authentication token
+            cache_dir: Directory for cached library scans (disabled if None)
+            cache_max_age: Days before a cached library scan is refreshed
+            session: HTTP session to reuse for Plex requests (a pooled one is created if None)
         """
-        self.plex = PlexServer(plex_url, plex_token)
+        from plexapi.server import PlexServer
 
-        logger.info(f"Connected to Plex server: {self.plex.friendlyName}")
+        self.plex = PlexServer(plex_url, plex_token, session=session or _create_session())
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir else None
+        self.cache_max_age = cache_max_age * 86400
+        self._cancelled = threading.Event()
 
-    def get_system_info(self):
-        """Get comprehensive system information about the Plex server."""
-        import platform
+        # Web URL prefix shared by every item, only the rating key varies
+        self._url_prefix = (f"{self.plex._baseurl}/web/index.html#!/server/"
+                            f"{self.plex.machineIdentifier}/details?key=/library/metadata/")
+
+        logger.info("Connected to Plex server: %s", self.plex.friendlyName)
+
+    def cancel(self):
+        """Ask library scans running in other threads to stop at their next item."""
+        self._cancelled.set()
+
+    def _get_section(self, library):
+        """
+        Resolve a library section.
+
+        Args:
+            library: Library name, or an already-fetched library section
+
+        Returns:
+            Library section, or None if it could not be found
+        """
+        if not isinstance(library, str):
+            return library
+
+        try:
+            return self.plex.library.section(library)
+        except Exception as e:
+            logger.error("Could not find library '%s': %s", library, e)
+            return None
+
+    def _cache_file(self, library) -> Path:
+        """Get the cache file path for a library section."""
+        return self.cache_dir / f"{self.plex.machineIdentifier}_{library.key}.json"
+
+    def _load_cache(self, library, media_type: str = None):
+        """
+        Load a cached library scan.
+
+        Returns:
+            Cache contents, or None if there is no cache, it has expired or it
+            was written by a different cache version
+        """
+        if not self.cache_dir:
+            return None
+
+        try:
+            with open(self._cache_file(library), 'rb') as f:
+                cached = _json_loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+        if (cached.get('version') != CACHE_VERSION
+                or time.time() - cached.get('saved_at', 0) > self.cache_max_age
+                or cached.get('media_type') != media_type
+                or cached.get('plex_url') != self.plex._baseurl
+                or 'items' not in cached):
+            return None
+
+        return cached
+
+    def _save_cache(self, library, library_items: list, media_type: str = None, item_updated_at: dict = None):
+        """Save a library scan, and the updatedAt of each scanned item, to the cache."""
+        if not self.cache_dir:
+            return
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self._cache_file(library), 'wb') as f:
+                f.write(_json_dumps({
+                    'version': CACHE_VERSION,
+                    'saved_at': time.time(),
+                    'updated_at': str(library.updatedAt),
+                    'media_type': media_type,
+                    'plex_url': self.plex._baseurl,
+                    'item_updated_at': item_updated_at or {},
+                    'items': library_items
+                }))
+        except OSError as e:
+            logger.debug("Could not write cache for '%s': %s", library.title, e)
+
+    def _get_library_items(self, library, media_type: str = None, **kwargs) -> list:
+        """
+        Enumerate the playable items of a library section.
+
+        Shows are expanded to their episodes and music artists to their
+        tracks; every other library type returns its top-level items.
+
+        Args:
+            library: Plex library section
+            media_type: Force 'movie' or 'episode' enumeration
+            **kwargs: Extra search arguments (e.g. container_start, maxresults)
+
+        Returns:
+            List of Plex items
+        """
+        kwargs.setdefault('container_size', PLEX_CONTAINER_SIZE)
+
+        if media_type == 'movie' or library.type == 'movie':
+            return library.all(**kwargs)
+
+        # Query episodes and tracks at the section level - walking each show
+        # or artist/album costs one extra request per parent
+        if media_type == 'episode' or library.type == 'show':
+            return library.search(libtype='episode', **kwargs)
+        elif library.type == 'artist':
+            # Music library - get all tracks
+            return library.search(libtype='track', **kwargs)
+
+        # Other library types - try to get all items
+        return library.all(**kwargs)
+
+    def _load_full_items(self, items: list, wanted=None) -> list:
+        """
+        Replace listed items with their full metadata, fetched in batched requests.
+
+        Section listings leave out media stream details. Fetching them for a
+        batch of rating keys at once avoids reloading every item on its own.
+
+        Args:
+            items: Items from a section listing
+            wanted: Predicate selecting the items to fetch (all if None), the
+                rest are kept as listed
+
+        Returns:
+            The items in listing order, minus any removed from the server
+            since they were listed
+        """
+        keys = [item.ratingKey for item in items if wanted is None or wanted(item)]
+        full_items = {}
+        for start in range(0, len(keys), PLEX_METADATA_BATCH_SIZE):
+            batch = ','.join(str(key) for key in keys[start:start + PLEX_METADATA_BATCH_SIZE])
+            for full_item in self.plex.fetchItems(f'/library/metadata/{batch}'):
+                full_items[full_item.ratingKey] = full_item
+
+        requested = set(keys)
+        return [full_items.get(item.ratingKey, item) for item in items
+                if item.ratingKey in full_items or item.ratingKey not in requested]
+
+    def _iter_library_items(self, library, media_type: str = None, details_for=None):
+        """
+        Yield the playable items of a library section one page at a time.
+
+        Pages are fetched by a background thread, so the next page is
+        already on its way while the caller processes the current one,
+        and only a couple of pages are held in memory at once.
+
+        Args:
+            library: Plex library section
+            media_type: Force 'movie' or 'episode' enumeration
+            details_for: Predicate selecting the items to yield with full
+                metadata, including media streams (see _load_full_items).
+                Items are yielded as listed if None
+        """
+        pages = queue.Queue(maxsize=2)
+        done = object()
+        # Set once the caller stops iterating, e.g. on a cancelled scan
+        stopped = threading.Event()
+
+        def put(page) -> bool:
+            # Wait for room in the queue, but give up once nobody is reading it
+            while not stopped.is_set():
+                try:
+                    pages.put(page, timeout=0.5)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def fetch_pages():
+            try:
+                start = 0
+                while not (stopped.is_set() or self._cancelled.is_set()):
+                    listed = self._get_library_items(library, media_type,
+                                                     container_start=start,
+                                                     maxresults=PLEX_CONTAINER_SIZE)
+                    page = listed if details_for is None else self._load_full_items(listed, details_for)
+                    if not put(page):
+                        return
+                    if len(listed) < PLEX_CONTAINER_SIZE:
+                        break
+                    start += PLEX_CONTAINER_SIZE
+            except Exception as e:
+                put(e)
+            put(done)
+
+        threading.Thread(target=fetch_pages, daemon=True).start()
+
+        try:
+            while True:
+                page = pages.get()
+                if page is done:
+                    return
+                if isinstance(page, Exception):
+                    raise page
+                yield from page
+        finally:
+            stopped.set()
+
+    def _get_local_stats(self) -> dict:
+        """Get CPU, memory, disk, network and GPU stats for the local machine."""
+        import socket
         import psutil
-        from datetime import datetime
 
         system_info = {}
 
-        # Basic system info
-        system_info['hostname'] = platform.node()
-        system_info['os'] = platform.system()
-        system_info['os_version'] = platform.release()
-        system_info['architecture'] = platform.machine()
-        system_info['python_version'] = platform.python_version()
-
         # CPU Information
         system_info['cpu_physical_cores'] = psutil.cpu_count(logical=False)
         system_info['cpu_logical_cores'] = psutil.cpu_count(logical=True)
-        system_info['cpu_usage_percent'] = psutil.cpu_percent(interval=1, percpu=False)
-        system_info['cpu_usage_per_core'] = psutil.cpu_percent(interval=1, percpu=True)
+        # Sample once per core and derive the overall figure, instead of
+        # blocking for a second sample interval twice
+        per_core = psutil.cpu_percent(interval=1, percpu=True)
+        system_info['cpu_usage_per_core'] = per_core
+        system_info['cpu_usage_percent'] = round(sum(per_core) / len(per_core), 1) if per_core else 0.0
 
         try:
             cpu_freq = psutil.cpu_freq()
@@ -112,7 +397,7 @@ class PlexTools:
         for interface_name, interface_addresses in net_if_addrs.items():
             addrs = []
             for address in interface_addresses:
-                if str(address.family) == 'AddressFamily.AF_INET':
+                if address.family == socket.AF_INET:
                     addrs.append({
                         'type': 'IPv4',
                         'address': address.address,
@@ -138,7 +423,7 @@ class PlexTools:
         except ImportError:
             system_info['gpu_info'] = None
         except Exception as e:
-            logger.debug(f"Could not get GPU info: {e}")
+            logger.debug("Could not get GPU info: %s", e)
             system_info['gpu_info'] = None
 
         # System uptime
@@ -149,6 +434,49 @@ class PlexTools:
         except:
             pass
 
+        return system_info
+
+    def _get_library_size_info(self, section) -> dict:
+        """Get the item count and total file size of a library section."""
+        lib_info = {
+            'name': section.title,
+            'type': section.type,
+        }
+
+        # Calculate total library size and item count
+        total_size = 0
+
+        items = self._get_library_items(section)
+        items_count = len(items)
+        for item in items:
+            part = self._get_first_part(item)
+            if part is not None and part.size:
+                total_size += part.size
+
+        lib_info['items_count'] = items_count
+        lib_info['total_size'] = total_size
+        return lib_info
+
+    def get_system_info(self, include_local_stats: bool = True, max_workers: int = 4):
+        """
+        Get comprehensive system information about the Plex server.
+
+        Args:
+            include_local_stats: Also sample CPU, memory, disk, network and
+                GPU stats of the machine running this script
+            max_workers: Number of libraries to enumerate in parallel
+        """
+        import platform
+
+        system_info = {}
+
+        # Basic system info
+        system_info['hostname'] = platform.node()
+        system_info['os'] = platform.system()
+        system_info['os_version'] = platform.release()
+        system_info['architecture'] = platform.machine()
+        system_info['python_version'] = platform.python_version()
+
         # Plex Server Info
         try:
             system_info['plex_version'] = self.plex.version
@@ -157,95 +485,20 @@ class PlexTools:
             system_info['plex_friendly_name'] = self.plex.friendlyName
             system_info['plex_machine_identifier'] = self.plex.machineIdentifier
         except Exception as e:
-            logger.debug(f"Could not get Plex server info: {e}")
+            logger.debug("Could not get Plex server info: %s", e)
 
-        # Library Statistics
+        # Library Statistics - each library is enumerated independently, so
+        # fetch them concurrently instead of one after another
         system_info['libraries'] = []
         try:
-            for section in self.plex.library.sections():
-                lib_info = {
-                    'name': section.title,
-                    'type': section.type,
-                }
-
-                # Calculate total library size and item count
-                total_size = 0
-                items_count = 0
-
-                if section.type == 'movie':
-                    items = section.all()
-                    items_count = len(items)
-                    for item in items:
-                        try:
-                            if item.media and len(item.media) > 0:
-                                if item.media[0].parts and len(item.media[0].parts) > 0:
-                                    size_bytes = item.media[0].parts[0].size
-                                    if size_bytes:
-                                        total_size += size_bytes
-                        except:
-                            continue
-
-                elif section.type == 'show':
-                    # For TV shows, count episodes not shows
-                    shows = section.all()
-                    for show in shows:
-                        try:
-                            episodes = show.episodes()
-                            items_count += len(episodes)
-                            for episode in episodes:
-                                try:
-                                    if episode.media and len(episode.media) > 0:
-                                        if episode.media[0].parts and len(episode.media[0].parts) > 0:
-                                            size_bytes = episode.media[0].parts[0].size
-                                            if size_bytes:
-                                                total_size += size_bytes
-                                except:
-                                    continue
-                        except:
-                            continue
-
-                elif section.type == 'artist':
-                    # For music, count tracks not artists
-                    artists = section.all()
-                    for artist in artists:
-                        try:
-                            albums = artist.albums()
-                            for album in albums:
-                                try:
-                                    tracks = album.tracks()
-                                    items_count += len(tracks)
-                                    for track in tracks:
-                                        try:
-                                            if track.media and len(track.media) > 0:
-                                                if track.media[0].parts and len(track.media[0].parts) > 0:
-                                                    size_bytes = track.media[0].parts[0].size
-                                                    if size_bytes:
-                                                        total_size += size_bytes
-                                        except:
-                                            continue
-                                except:
-                                    continue
-                        except:
-                            continue
-                else:
-                    # For other types, just count items
-                    items = section.all()
-                    items_count = len(items)
-                    for item in items:
-                        try:
-                            if item.media and len(item.media) > 0:
-                                if item.media[0].parts and len(item.media[0].parts) > 0:
-                                    size_bytes = item.media[0].parts[0].size
-                                    if size_bytes:
-                                        total_size += size_bytes
-                        except:
-                            continue
-
-                lib_info['items_count'] = items_count
-                lib_info['total_size'] = total_size
-                system_info['libraries'].append(lib_info)
+            sections = self.plex.library.sections()
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                system_info['libraries'].extend(executor.map(self._get_library_size_info, sections))
         except Exception as e:
-            logger.debug(f"Could not get library info: {e}")
+            logger.debug("Could not get library info: %s", e)
+
+        if include_local_stats:
+            system_info.update(self._get_local_stats())
 
         return system_info
 
@@ -361,7 +614,7 @@ class PlexTools:
                 if media.audioCodec:
                     quality_info['audio_codec'] = media.audioCodec.upper()
         except Exception as e:
-            logger.debug(f"Could not get media quality: {e}")
+            logger.debug("Could not get media quality: %s", e)
 
         return quality_info
 
@@ -374,65 +627,52 @@ class PlexTools:
         }
 
         try:
-            watch_info['watched'] = item.isWatched if hasattr(item, 'isWatched') else False
-            watch_info['view_count'] = item.viewCount if hasattr(item, 'viewCount') else 0
+            watch_info['watched'] = getattr(item, 'isWatched', False)
+            watch_info['view_count'] = getattr(item, 'viewCount', 0)
 
-            if hasattr(item, 'lastViewedAt') and item.lastViewedAt:
-                watch_info['last_viewed_at'] = item.lastViewedAt.strftime("%Y-%m-%d %H:%M:%S")
+            last_viewed_at = getattr(item, 'lastViewedAt', None)
+            if last_viewed_at:
+                watch_info['last_viewed_at'] = last_viewed_at.strftime("%Y-%m-%d %H:%M:%S")
         except Exception as e:
-            logger.debug(f"Could not get watch info: {e}")
+            logger.debug("Could not get watch info: %s", e)
 
         return watch_info
 
     def analyze_library_quality(self, library_name: str) -> dict:
         """Analyze video quality and codec distribution in a library."""
-        try:
-            library = self.plex.library.section(library_name)
-        except Exception as e:
-            logger.error(f"Could not find library '{library_name}': {e}")
+        library = self._get_section(library_name)
+        if library is None:
             return {}
 
         stats = {
-            'resolutions': {},
-            'video_codecs': {},
-            'audio_codecs': {},
+            'resolutions': Counter(),
+            'video_codecs': Counter(),
+            'audio_codecs': Counter(),
             'total_items': 0
         }
 
         # Get items
         items = []
-        if library.type == 'movie':
-            items = library.all()
-        elif library.type == 'show':
-            for show in library.all():
-                items.extend(show.episodes())
+        if library.type in ('movie', 'show'):
+            items = self._get_library_items(library)
 
-        logger.info(f"Analyzing {len(items)} items for quality metrics...")
+        logger.info("Analyzing %d items for quality metrics...", len(items))
 
+        stats['total_items'] = len(items)
         for item in items:
-            stats['total_items'] += 1
             quality = self.get_media_quality(item)
 
-            # Count resolutions
-            res = quality['resolution']
-            stats['resolutions'][res] = stats['resolutions'].get(res, 0) + 1
-
-            # Count video codecs
-            vcodec = quality['video_codec']
-            stats['video_codecs'][vcodec] = stats['video_codecs'].get(vcodec, 0) + 1
-
-            # Count audio codecs
-            acodec = quality['audio_codec']
-            stats['audio_codecs'][acodec] = stats['audio_codecs'].get(acodec, 0) + 1
+            # Count resolutions and codecs
+            stats['resolutions'][quality['resolution']] += 1
+            stats['video_codecs'][quality['video_codec']] += 1
+            stats['audio_codecs'][quality['audio_codec']] += 1
 
         return stats
 
     def analyze_library_stats(self, library_name: str) -> dict:
         """Get general statistics for a library."""
-        try:
-            library = self.plex.library.section(library_name)
-        except Exception as e:
-            logger.error(f"Could not find library '{library_name}': {e}")
+        library = self._get_section(library_name)
+        if library is None:
             return {}
 
         stats = {
@@ -441,33 +681,24 @@ class PlexTools:
             'watched_count': 0,
             'unwatched_count': 0,
             'total_duration': 0,
-            'by_year': {},
-            'by_genre': {},
-            'by_rating': {},
+            'by_year': Counter(),
+            'by_genre': Counter(),
+            'by_rating': Counter(),
         }
 
         # Get items
         items = []
-        if library.type == 'movie':
-            items = library.all()
-        elif library.type == 'show':
-            for show in library.all():
-                items.extend(show.episodes())
+        if library.type in ('movie', 'show'):
+            items = self._get_library_items(library)
 
-        logger.info(f"Analyzing {len(items)} items for statistics...")
+        logger.info("Analyzing %d items for statistics...", len(items))
 
+        stats['total_items'] = len(items)
         for item in items:
-            stats['total_items'] += 1
-
             # Size
-            filesize_bytes = 0
-            try:
-                if item.media and len(item.media) > 0:
-                    if item.media[0].parts and len(item.media[0].parts) > 0:
-                        filesize_bytes = item.media[0].parts[0].size or 0
-                        stats['total_size'] += filesize_bytes
-            except:
-                pass
+            part = self._get_first_part(item)
+            if part is not None and part.size:
+                stats['total_size'] += part.size
 
             # Watch status
             watch_info = self.get_watch_info(item)
@@ -486,28 +717,23 @@ class PlexTools:
             # Year (for movies and shows)
             try:
                 if hasattr(item, 'year') and item.year:
-                    year = str(item.year)
-                    stats['by_year'][year] = stats['by_year'].get(year, 0) + 1
+                    stats['by_year'][str(item.year)] += 1
                 elif hasattr(item, 'originallyAvailableAt') and item.originallyAvailableAt:
-                    year = str(item.originallyAvailableAt.year)
-                    stats['by_year'][year] = stats['by_year'].get(year, 0) + 1
+                    stats['by_year'][str(item.originallyAvailableAt.year)] += 1
             except:
                 pass
 
             # Genres
             try:
                 if hasattr(item, 'genres'):
-                    for genre in item.genres:
-                        genre_name = genre.tag
-                        stats['by_genre'][genre_name] = stats['by_genre'].get(genre_name, 0) + 1
+                    stats['by_genre'].update(genre.tag for genre in item.genres)
             except:
                 pass
 
             # Content rating
             try:
                 if hasattr(item, 'contentRating') and item.contentRating:
-                    rating = item.contentRating
-                    stats['by_rating'][rating] = stats['by_rating'].get(rating, 0) + 1
+                    stats['by_rating'][item.contentRating] += 1
             except:
                 pass
 
@@ -515,10 +741,8 @@ class PlexTools:
 
     def check_library_health(self, library_name: str) -> dict:
         """Check library health and identify potential issues."""
-        try:
-            library = self.plex.library.section(library_name)
-        except Exception as e:
-            logger.error(f"Could not find library '{library_name}': {e}")
+        library = self._get_section(library_name)
+        if library is None:
             return {}
 
         health = {
@@ -530,21 +754,20 @@ class PlexTools:
             'never_watched': [],
         }
 
-        # Get items
+        # Get items - with their full metadata, since listings leave out the
+        # subtitle streams, fetched a batch at a time rather than reloading
+        # each item
         items = []
-        if library.type == 'movie':
-            items = library.all()
-        elif library.type == 'show':
-            for show in library.all():
-                items.extend(show.episodes())
+        if library.type in ('movie', 'show'):
+            items = self._load_full_items(self._get_library_items(library))
 
-        logger.info(f"Checking health for {len(items)} items...")
+        logger.info("Checking health for %d items...", len(items))
 
         for item in items:
             health['total_items'] += 1
 
             item_name = item.title
-            if isinstance(item, Episode):
+            if item.type == 'episode':
                 item_name = f"{item.grandparentTitle} - S{item.seasonNumber:02d}E{item.index:02d} - {item.title}"
 
             # Check for missing metadata
@@ -574,27 +797,21 @@ class PlexTools:
                 })
 
             # Check for missing subtitles
-            subtitle_info = self.get_subtitle_info(item)
-            if not subtitle_info['has_subtitles']:
+            if not self.has_subtitles(item, streams_loaded=True):
                 health['no_subtitles'].append({
                     'title': item_name,
                     'rating_key': item.ratingKey
                 })
 
             # Check for very large files (>50GB)
-            filesize_bytes = 0
-            try:
-                if item.media and len(item.media) > 0:
-                    if item.media[0].parts and len(item.media[0].parts) > 0:
-                        filesize_bytes = item.media[0].parts[0].size or 0
-                        if filesize_bytes > 50 * 1024 * 1024 * 1024:  # 50GB
-                            health['very_large_files'].append({
-                                'title': item_name,
-                                'size': filesize_bytes,
-                                'rating_key': item.ratingKey
-                            })
-            except:
-                pass
+            part = self._get_first_part(item)
+            filesize_bytes = (part.size or 0) if part is not None else 0
+            if filesize_bytes > 50 * 1024 * 1024 * 1024:  # 50GB
+                health['very_large_files'].append({
+                    'title': item_name,
+                    'size': filesize_bytes,
+                    'rating_key': item.ratingKey
+                })
 
             # Check for never watched items
             watch_info = self.get_watch_info(item)
@@ -606,130 +823,175 @@ class PlexTools:
 
         return health
 
-    def get_filepath(self, item) -> str:
-        """Get the file path for an item."""
+    def _get_first_part(self, item):
+        """
+        Get the first media part of an item (usually there's only one).
+
+        Returns:
+            Media part, or None if the item has no media
+        """
         try:
-            if item.media and len(item.media) > 0:
-                if item.media[0].parts and len(item.media[0].parts) > 0:
-                    filepath = item.media[0].parts[0].file
-                    if filepath:
-                        return filepath
-        except Exception as e:
-            logger.debug(f"Could not get filepath: {e}")
-        return "Unknown"
+            return item.media[0].parts[0]
+        except (AttributeError, IndexError, TypeError):
+            return None
 
     def get_filepath(self, item) -> str:
         """Get the file path for an item."""
-        try:
-            if item.media and len(item.media) > 0:
-                if item.media[0].parts and len(item.media[0].parts) > 0:
-                    filepath = item.media[0].parts[0].file
-                    if filepath:
-                        return filepath
-        except Exception as e:
-            logger.debug(f"Could not get filepath: {e}")
+        part = self._get_first_part(item)
+        if part is not None and part.file:
+            return part.file
         return "Unknown"
 
     def get_filesize(self, item) -> str:
         """Get human-readable file size for an item."""
-        try:
-            # Get the first media part (usually there's only one)
-            if item.media and len(item.media) > 0:
-                if item.media[0].parts and len(item.media[0].parts) > 0:
-                    size_bytes = item.media[0].parts[0].size
-                    if size_bytes:
-                        # Convert to human readable
-                        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-                            if size_bytes < 1024.0:
-                                return f"{size_bytes:.2f} {unit}"
-                            size_bytes /= 1024.0
-        except Exception as e:
-            logger.debug(f"Could not get filesize: {e}")
+        part = self._get_first_part(item)
+        size_bytes = part.size if part is not None else None
+        if size_bytes:
+            # Convert to human readable
+            for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+                if size_bytes < 1024.0:
+                    return f"{size_bytes:.2f} {unit}"
+                size_bytes /= 1024.0
         return "Unknown"
 
-    def get_subtitle_info(self, item) -> dict:
-        """Get detailed subtitle information for an item."""
+    def _iter_subtitle_streams(self, item, streams_loaded: bool = False):
+        """
+        Yield the subtitle streams of an item.
+
+        Section listings carry no stream details, so playable items go
+        through subtitleStreams(), which reloads partial objects first.
+        Items whose full metadata was already fetched (streams_loaded), and
+        items without it (e.g. photo albums), are read from their media parts.
+        """
+        if not streams_loaded and hasattr(item, 'subtitleStreams'):
+            yield from item.subtitleStreams()
+            return
+
+        for media in getattr(item, 'media', None) or []:
+            for part in media.parts:
+                yield from part.subtitleStreams()
+
+    def has_subtitles(self, item, streams_loaded: bool = False) -> bool:
+        """Check whether an item has any subtitle stream, stopping at the first one."""
+        return any(True for _ in self._iter_subtitle_streams(item, streams_loaded))
+
+    def get_subtitle_info(self, item, streams_loaded: bool = False) -> dict:
+        """
+        Get detailed subtitle information for an item.
+
+        Args:
+            item: Plex item
+            streams_loaded: The item already carries its full metadata (see _load_full_items)
+        """
         subtitle_info = {
             'has_subtitles': False,
             'languages': [],
             'count': 0,
             'streams': []
         }
+        seen_languages = set()
 
-        for stream in item.subtitleStreams():
+        for stream in self._iter_subtitle_streams(item, streams_loaded):
             subtitle_info['has_subtitles'] = True
             subtitle_info['count'] += 1
 
-            # Get language info
-            lang_code = stream.languageCode if stream.languageCode else 'unknown'
-            lang_name = stream.language if stream.language else 'Unknown'
+            # Get normalized language info
+            lang_code = _normalize_language_code(stream.languageCode or 'unknown')
+            lang_name = stream.language or 'Unknown'
 
-            # Normalize language code
-            if lang_code and len(lang_code) == 3:
-                conversions = {'eng': 'en', 'spa': 'es', 'fra': 'fr', 'deu': 'de', 'ita': 'it', 'por': 'pt'}
-                lang_code = conversions.get(lang_code.lower(), lang_code[:2])
-            elif lang_code:
-                lang_code = lang_code.lower()
-
-            if lang_code not in subtitle_info['languages']:
+            if lang_code not in seen_languages:
+                seen_languages.add(lang_code)
                 subtitle_info['languages'].append(lang_code)
 
             subtitle_info['streams'].append({
                 'language': lang_name,
                 'language_code': lang_code,
-                'title': stream.title if hasattr(stream, 'title') and stream.title else None,
-                'format': stream.codec if hasattr(stream, 'codec') else stream.format if hasattr(stream,
-                                                                                                 'format') else 'srt',
-                'forced': stream.forced if hasattr(stream, 'forced') else False,
+                'title': getattr(stream, 'title', None) or None,
+                'format': getattr(stream, 'codec', getattr(stream, 'format', 'srt')),
+                'forced': getattr(stream, 'forced', False),
                 'external': getattr(stream, 'external', False)
             })
 
         return subtitle_info
 
-    def list_library(self, library_name: str, media_type: str = None):
+    def list_library(self, library_name, media_type: str = None, missing_only: bool = False):
         """
         List all items in library with subtitle details.
 
         Args:
-            library_name: Library name to scan
+            library_name: Library name, or an already-fetched library section, to scan
             media_type: Filter by 'movie' or 'episode'
+            missing_only: Only return items without subtitles
 
         Returns:
             List of items with subtitle info
         """
-        try:
-            library = self.plex.library.section(library_name)
-        except Exception as e:
-            logger.error(f"Could not find library '{library_name}': {e}")
+        library = self._get_section(library_name)
+        if library is None:
             return []
 
-        logger.info(f"\nScanning library: {library_name}")
-        logger.info(f"{'=' * 60}")
-
-        # Get items
-        items = []
-        if media_type == 'movie' or library.type == 'movie':
-            items = library.all()
-        elif media_type == 'episode' or library.type == 'show':
-            for show in library.all():
-                for episode in show.episodes():
-                    items.append(episode)
-        elif library.type == 'artist':
-            # Music library - get all tracks
-            for artist in library.all():
-                for album in artist.albums():
-                    for track in album.tracks():
-                        items.append(track)
-        else:
-            # Other library types - try to get all items
-            items = library.all()
-
-        logger.info(f"Scanning {len(items)} items...")
+        logger.info("\nScanning library: %s", library.title)
+        logger.info("=" * 60)
+
+        cached = self._load_cache(library, media_type)
+        if cached is not None and cached.get('updated_at') == str(library.updatedAt):
+            cached_items = cached['items']
+            logger.info("Library unchanged since last scan, using %d cached items", len(cached_items))
+            if missing_only:
+                cached_items = [item for item in cached_items if not item['has_subtitles']]
+            return cached_items
+
+        # The library changed since the cached scan, but usually only a few of
+        # its items did - reuse the entries whose own updatedAt still matches
+        previous_items = {}
+        previous_updated_at = {}
+        if cached is not None:
+            previous_items = {str(entry['rating_key']): entry for entry in cached['items']}
+            previous_updated_at = cached.get('item_updated_at', {})
+
+        def unchanged(item):
+            rating_key = str(item.ratingKey)
+            return rating_key in previous_items and previous_updated_at.get(rating_key) == str(item.updatedAt)
 
         library_items = []
+        item_updated_at = {}
+        scanned = 0
+        reused = 0
+
+        # Items that get rebuilt need their subtitle streams, which listings
+        # leave out - fetch their full metadata a batch at a time rather than
+        # reloading each item
+        for item in self._iter_library_items(library, media_type,
+                                             details_for=lambda item: not unchanged(item)):
+            if self._cancelled.is_set():
+                # Interrupted - the partial scan is discarded, so don't cache it
+                return library_items
+
+            scanned += 1
+            rating_key = str(item.ratingKey)
+            item_updated_at[rating_key] = str(item.updatedAt)
+
+            if unchanged(item):
+                reused += 1
+                # Watching an item leaves its updatedAt alone - take the watch
+                # status from the listing rather than the cached entry
+                watch_info = self.get_watch_info(item)
+                previous = dict(previous_items[rating_key],
+                                watched=watch_info['watched'],
+                                view_count=watch_info['view_count'],
+                                last_viewed=watch_info['last_viewed_at'])
+                if not (missing_only and previous['has_subtitles']):
+                    library_items.append(previous)
+                continue
+
+            if missing_only:
+                # Stop at the first subtitle stream, anything past it gets filtered out
+                if self.has_subtitles(item, streams_loaded=True):
+                    continue
+                subtitle_info = {'has_subtitles': False, 'languages': [], 'streams': []}
+            else:
+                subtitle_info = self.get_subtitle_info(item, streams_loaded=True)
 
-        for item in items:
-            subtitle_info = self.get_subtitle_info(item)
             filepath = self.get_filepath(item)
             filesize = self.get_filesize(item)
             quality_info = self.get_media_quality(item)
@@ -738,7 +1000,7 @@ class PlexTools:
             item_name = item.title
             item_type = 'other'
 
-            if isinstance(item, Episode):
+            if item.type == 'episode':
                 item_name = f"{item.grandparentTitle} - S{item.seasonNumber:02d}E{item.index:02d} - {item.title}"
                 item_type = 'episode'
             elif library.type == 'movie':
@@ -751,7 +1013,7 @@ class PlexTools:
                 except:
                     pass
 
-            plex_url = f"{self.plex._baseurl}/web/index.html#!/server/{self.plex.machineIdentifier}/details?key=/library/metadata/{item.ratingKey}"
+            plex_url = self._url_prefix + rating_key
 
             library_items.append({
                 'title': item_name,
@@ -771,110 +1033,115 @@ class PlexTools:
                 'subtitle_streams': subtitle_info['streams']
             })
 
-        return library_items
+        logger.info("Scanned %d items (%d unchanged since the cached scan)", scanned, reused)
 
-    def print_library_list(self, library_items: list):
-        """Print formatted list of library items with subtitle details."""
-        print("\n" + "=" * 80)
-        print("LIBRARY ITEMS WITH SUBTITLE DETAILS")
-        print("=" * 80)
-        print(f"Total items: {len(library_items)}")
+        # A filtered scan is incomplete, only cache full ones
+        if not missing_only:
+            self._save_cache(library, library_items, media_type, item_updated_at)
 
-        # Count items with/without subtitles
-        with_subs = len([item for item in library_items if item['has_subtitles']])
-        without_subs = len(library_items) - with_subs
+        return library_items
 
-        print(f"Items with subtitles: {with_subs}")
-        print(f"Items without subtitles: {without_subs}")
-        print("=" * 80)
+    def _iter_library_report(self, library_items: list):
+        """Yield the formatted library report line by line."""
+        yield "\n" + "=" * 80 + "\n"
+        yield "LIBRARY ITEMS WITH SUBTITLE DETAILS\n"
+        yield "=" * 80 + "\n"
+        yield f"Total items: {len(library_items)}\n"
+
+        # Count items with/without subtitles, split by type and group episodes
+        # by show in one pass
+        movies = []
+        shows = {}
+        episode_count = 0
+        with_subs = 0
+        for item in library_items:
+            if item['has_subtitles']:
+                with_subs += 1
+            item_type = item['type']
+            if item_type == 'movie':
+                movies.append(item)
+            elif item_type == 'episode':
+                shows.setdefault(item['title'].partition(' - ')[0], []).append(item)
+                episode_count += 1
+        without_subs = len(library_items) - with_subs
 
-        movies = [item for item in library_items if item['type'] == 'movie']
-        episodes = [item for item in library_items if item['type'] == 'episode']
+        yield f"Items with subtitles: {with_subs}\n"
+        yield f"Items without subtitles: {without_subs}\n"
+        yield "=" * 80 + "\n"
 
         if movies:
-            print(f"\nMOVIES ({len(movies)} items)")
-            print("-" * 80)
+            yield f"\nMOVIES ({len(movies)} items)\n"
+            yield "-" * 80 + "\n"
             for idx, item in enumerate(movies, 1):
-                print(f"\n{idx}. {item['title']}")
-                print(f"   Rating Key: {item['rating_key']}")
-                print(f"   File Path: {item['filepath']}")
-                print(f"   URL: {item['url']}")
-                print(f"   File Size: {item['filesize']}")
-                print(f"   Quality: {item['resolution']} | Video: {item['video_codec']} | Audio: {item['audio_codec']}")
-                print(f"   Watched: {'✓ Yes' if item['watched'] else '✗ No'} (Views: {item['view_count']})")
+                yield (f"\n{idx}. {item['title']}\n"
+                       f"   Rating Key: {item['rating_key']}\n"
+                       f"   File Path: {item['filepath']}\n"
+                       f"   URL: {item['url']}\n"
+                       f"   File Size: {item['filesize']}\n"
+                       f"   Quality: {item['resolution']} | Video: {item['video_codec']} | Audio: {item['audio_codec']}\n"
+                       f"   Watched: {'✓ Yes' if item['watched'] else '✗ No'} (Views: {item['view_count']})\n")
                 if item['last_viewed']:
-                    print(f"   Last Viewed: {item['last_viewed']}")
+                    yield f"   Last Viewed: {item['last_viewed']}\n"
 
                 if item['has_subtitles']:
-                    print(f"   Subtitles: YES")
-                    print(
-                        f"   Languages: {', '.join(set(item['languages'])).upper() if item['languages'] else 'Unknown'}")
-                    print(f"   Streams:")
+                    yield (f"   Subtitles: YES\n"
+                           f"   Languages: {', '.join(set(item['languages'])).upper() if item['languages'] else 'Unknown'}\n"
+                           f"   Streams:\n")
                     for stream in item['subtitle_streams']:
                         forced = " [FORCED]" if stream['forced'] else ""
                         title = f" - {stream['title']}" if stream['title'] else ""
                         external = " [EXTERNAL]" if stream['external'] else " [EMBEDDED]"
-                        print(
-                            f"     • {stream['language']} ({stream['language_code'].upper()}) - {stream['format']}{title}{forced}{external}")
+                        yield f"     • {stream['language']} ({stream['language_code'].upper()}) - {stream['format']}{title}{forced}{external}\n"
                 else:
-                    print(f"   Subtitles: NO")
+                    yield f"   Subtitles: NO\n"
 
-        if episodes:
-            print(f"\n\nTV EPISODES ({len(episodes)} items)")
-            print("-" * 80)
-
-            # Group by show
-            shows = {}
-            for ep in episodes:
-                show_name = ep['title'].split(' - ')[0]
-                if show_name not in shows:
-                    shows[show_name] = []
-                shows[show_name].append(ep)
+        if shows:
+            yield f"\n\nTV EPISODES ({episode_count} items)\n"
+            yield "-" * 80 + "\n"
 
             for show_name, eps in sorted(shows.items()):
-                print(f"\n{show_name} ({len(eps)} episodes)")
+                yield f"\n{show_name} ({len(eps)} episodes)\n"
                 for ep in sorted(eps, key=lambda x: x['title']):
-                    print(f"\n  {ep['title']}")
-                    print(f"    Rating Key: {ep['rating_key']}")
-                    print(f"    File Path: {ep['filepath']}")
-                    print(f"    URL: {ep['url']}")
-                    print(f"    File Size: {ep['filesize']}")
-                    print(f"    Quality: {ep['resolution']} | Video: {ep['video_codec']} | Audio: {ep['audio_codec']}")
-                    print(f"    Watched: {'✓ Yes' if ep['watched'] else '✗ No'} (Views: {ep['view_count']})")
+                    yield (f"\n  {ep['title']}\n"
+                           f"    Rating Key: {ep['rating_key']}\n"
+                           f"    File Path: {ep['filepath']}\n"
+                           f"    URL: {ep['url']}\n"
+                           f"    File Size: {ep['filesize']}\n"
+                           f"    Quality: {ep['resolution']} | Video: {ep['video_codec']} | Audio: {ep['audio_codec']}\n"
+                           f"    Watched: {'✓ Yes' if ep['watched'] else '✗ No'} (Views: {ep['view_count']})\n")
 
                     if ep['has_subtitles']:
-                        print(f"    Subtitles: YES")
-                        print(
-                            f"    Languages: {', '.join(set(ep['languages'])).upper() if ep['languages'] else 'Unknown'}")
-                        print(f"    Streams:")
+                        yield (f"    Subtitles: YES\n"
+                               f"    Languages: {', '.join(set(ep['languages'])).upper() if ep['languages'] else 'Unknown'}\n"
+                               f"    Streams:\n")
                         for stream in ep['subtitle_streams']:
                             forced = " [FORCED]" if stream['forced'] else ""
                             title = f" - {stream['title']}" if stream['title'] else ""
                             external = " [EXTERNAL]" if stream['external'] else " [EMBEDDED]"
-                            print(
-                                f"      • {stream['language']} ({stream['language_code'].upper()}) - {stream['format']}{title}{forced}{external}")
+                            yield f"      • {stream['language']} ({stream['language_code'].upper()}) - {stream['format']}{title}{forced}{external}\n"
                     else:
-                        print(f"    Subtitles: NO")
+                        yield f"    Subtitles: NO\n"
 
-        print("\n" + "=" * 80)
-        print()
-
-    def save_library_report(self, library_items: list, output_file: str = "library_subtitles.txt"):
-        """Save the library report to a file."""
-        import io
-        from contextlib import redirect_stdout
+        yield "\n" + "=" * 80 + "\n"
+        yield "\n"
 
-        # Capture print output
-        f = io.StringIO()
-        with redirect_stdout(f):
-            self.print_library_list(library_items)
+    def print_library_list(self, library_items: list, file=None):
+        """
+        Print formatted list of library items with subtitle details.
 
-        report = f.getvalue()
+        Args:
+            library_items: Items returned by list_library
+            file: Stream to write to (default: stdout)
+        """
+        (file or sys.stdout).writelines(self._iter_library_report(library_items))
 
-        with open(output_file, 'w', encoding='utf-8') as file:
-            file.write(report)
+    def save_library_report(self, library_items: list, output_file: str = "library_subtitles.txt"):
+        """Save the library report to a file."""
+        # Stream the report straight to disk rather than capturing it in memory
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 16) as file:
+            self.print_library_list(library_items, file=file)
 
-        logger.info(f"Report saved to: {output_file}")
+        logger.info("Report saved to: %s", output_file)
 
 
 def main():
@@ -934,13 +1201,16 @@ For more information, see the README.md file.
     )
     parser.add_argument(
         '--plex-url',
-        default=os.getenv('PLEX_URL', 'http://localhost:32400'),
+        action=_EnvDefault,
+        envvar='PLEX_URL',
+        default='http://localhost:32400',
         help='Plex server URL (default: from .env or http://localhost:32400)'
     )
     parser.add_argument(
         '--plex-token',
-        default=os.getenv('PLEX_TOKEN'),
-        help='Plex authentication token (default: from .env)'
+        action=_EnvDefault,
+        envvar='PLEX_TOKEN',
+        help='Plex authentication token (required unless PLEX_TOKEN is set in .env)'
     )
     parser.add_argument(
         '--library',
@@ -966,78 +1236,84 @@ For more information, see the README.md file.
         metavar='FILE',
         help='Export all library data to standalone HTML file (e.g., plex_report.html)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=4,
+        help='Number of libraries to query in parallel for --export-json, --system and the library listing (default: 4)'
+    )
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='Reuse cached library scans, rescanning only items that changed since the last run'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        default=os.getenv('PLEX_INFO_CACHE_DIR', '~/.cache/plex_info'),
+        help='Directory for cached library scans (default: ~/.cache/plex_info)'
+    )
+    parser.add_argument(
+        '--cache-max-age',
+        type=float,
+        default=7,
+        metavar='DAYS',
+        help='Rescan cached libraries after this many days even if unchanged (default: 7)'
+    )
 
     args = parser.parse_args()
 
+    # The log format shows none of the thread/process fields, skip collecting
+    # them for every record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
 
-    # Validate
-    if not args.plex_token:
-        logger.error("PLEX_TOKEN is required. Set it in .env or pass --plex-token")
-        sys.exit(1)
+    # plexapi reloads a whole item whenever an attribute read from a partial
+    # object is empty - e.g. lastViewedAt on every unwatched item, or an empty
+    # summary or genre list - one extra request per item that returns the same
+    # empty value. Turn that off through plexapi's autoreload setting unless
+    # the user configured it. The one thing listings really lack is media
+    # streams, and those are fetched explicitly, in batches, rather than
+    # through auto-reload
+    from plexapi import CONFIG
+    if CONFIG.get('plexapi.autoreload') is None:
+        os.environ['PLEXAPI_PLEXAPI_AUTORELOAD'] = 'false'
+
+    session = _create_session()
 
     try:
         tools = PlexTools(
             plex_url=args.plex_url,
-            plex_token=args.plex_token
+            plex_token=args.plex_token,
+            cache_dir=args.cache_dir if args.cache else None,
+            cache_max_age=args.cache_max_age,
+            session=session
         )
 
         # If --export-json flag, export all data to JSON
         if args.export_json:
             logger.info(f"Exporting library data with embedded JSON to HTML...")
 
-            export_data = {
-                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                'server': {
-                    'name': tools.plex.friendlyName,
-                    'version': tools.plex.version,
-                    'platform': tools.plex.platform,
-                    'platform_version': tools.plex.platformVersion
-                },
-                'libraries': []
-            }
-
-            # Get all libraries
-            for section in tools.plex.library.sections():
-                logger.info(f"Processing library: {section.title}")
-
-                library_data = {
-                    'name': section.title,
-                    'type': section.type,
-                    'items': []
-                }
-
-                # Get all items in library
-                library_items = tools.list_library(section.title)
-                library_data['items'] = library_items
-
-                export_data['libraries'].append(library_data)
-
-            # Read the index.html template
+            # Read the index.html template first so a missing template fails
+            # before the (slow) library scan rather than after it
             template_path = Path(__file__).parent / 'index.html'
-            if not template_path.exists():
+            try:
+                with open(template_path, 'r', encoding='utf-8') as f:
+                    html_template = f.read()
+            except FileNotFoundError:
                 logger.error("index.html template not found!")
                 sys.exit(1)
 
-            with open(template_path, 'r', encoding='utf-8') as f:
-                html_template = f.read()
-
-            # Embed the JSON data into the HTML
-            json_data = json.dumps(export_data, indent=2, ensure_ascii=False)
-
             # Replace the loadData function to use embedded data instead of fetch
-            html_with_data = html_template.replace(
-                'let plexData = null;',
-                f'let plexData = {json_data};'
-            )
-
-            html_with_data = html_with_data.replace(
+            html_template = html_template.replace(
                 'window.addEventListener(\'DOMContentLoaded\', loadData);',
                 'window.addEventListener(\'DOMContentLoaded\', initializeWithEmbeddedData);'
             )
 
-            html_with_data = html_with_data.replace(
+            html_template = html_template.replace(
                 '''// Load data from JSON file
         async function loadData() {
             try {
@@ -1086,12 +1362,77 @@ For more information, see the README.md file.
             if not output_file.endswith('.html'):
                 output_file = output_file.replace('.json', '.html')
 
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(html_with_data)
+            export_data = {
+                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'server': {
+                    'name': tools.plex.friendlyName,
+                    'version': tools.plex.version,
+                    'platform': tools.plex.platform,
+                    'platform_version': tools.plex.platformVersion
+                }
+            }
+
+            # Get all libraries
+            sections = tools.plex.library.sections()
+            logger.info(f"Processing {len(sections)} libraries with {args.workers} workers...")
+
+            # Split the template around the data placeholder and stream the
+            # JSON straight into the file, one library at a time as its scan
+            # finishes, rather than holding every library until the end.
+            # Compact JSON keeps the page small; indentation alone can double
+            # it for large libraries. The page is written next to the output
+            # first so a failed scan never leaves a truncated page behind
+            head, _, tail = html_template.partition('let plexData = null;')
+            total_items = 0
+            partial_file = output_file + '.part'
+
+            try:
+                with open(partial_file, 'wb') as f:
+                    f.write(head.encode('utf-8'))
+                    f.write(b'let plexData = ')
+                    f.write(_json_dumps(export_data)[:-1])
+                    f.write(b',"libraries":[')
+
+                    # Scan libraries concurrently - each one is an independent set of
+                    # Plex requests, so the scans overlap instead of running back to back
+                    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+                        futures = [executor.submit(tools.list_library, section) for section in sections]
+
+                        try:
+                            for idx, (section, future) in enumerate(zip(sections, futures)):
+                                library_items = future.result()
+                                library_data = {
+                                    'name': section.title,
+                                    'type': section.type,
+                                    'items': library_items
+                                }
+
+                                if idx:
+                                    f.write(b',')
+                                f.write(_json_dumps(library_data))
+                                total_items += len(library_items)
+                        except KeyboardInterrupt:
+                            # Drop the queued scans and stop the running ones at their
+                            # next item, rather than waiting on every library before exiting
+                            for future in futures:
+                                future.cancel()
+                            tools.cancel()
+                            raise
+
+                    f.write(b']};')
+                    f.write(tail.encode('utf-8'))
+
+                os.replace(partial_file, output_file)
+            except BaseException:
+                # Failed or interrupted - don't leave the partial page behind
+                try:
+                    os.unlink(partial_file)
+                except OSError:
+                    pass
+                raise
 
             logger.info(f"✓ Successfully exported data to {output_file}")
-            logger.info(f"Total libraries: {len(export_data['libraries'])}")
-            total_items = sum(len(lib['items']) for lib in export_data['libraries'])
+            logger.info(f"Total libraries: {len(sections)}")
             logger.info(f"Total items: {total_items}")
             logger.info(f"Opening {output_file} in your browser...")
 
@@ -1102,23 +1443,23 @@ For more information, see the README.md file.
 
             file_path = os.path.abspath(output_file)
 
-            # Check if running in WSL2
+            # Check if running in WSL2 (the kernel release names Microsoft,
+            # which uname() reports without reading /proc/version)
             try:
-                with open('/proc/version', 'r') as f:
-                    if 'microsoft' in f.read().lower():
-                        # WSL2 - convert path to Windows format and use Windows browser
-                        # Convert /mnt/c/path to C:/path
-                        if file_path.startswith('/mnt/'):
-                            drive_letter = file_path[5].upper()
-                            windows_path = drive_letter + ':' + file_path[6:].replace('/', '\\')
-                        else:
-                            # Use wslpath to convert
-                            result = subprocess.run(['wslpath', '-w', file_path], capture_output=True, text=True)
-                            windows_path = result.stdout.strip()
-
-                        # Open with Windows default browser
-                        subprocess.run(['cmd.exe', '/c', 'start', windows_path], stderr=subprocess.DEVNULL)
-                        return
+                if 'microsoft' in platform.uname().release.lower():
+                    # WSL2 - convert path to Windows format and use Windows browser
+                    # Convert /mnt/c/path to C:/path
+                    if file_path.startswith('/mnt/'):
+                        drive_letter = file_path[5].upper()
+                        windows_path = drive_letter + ':' + file_path[6:].replace('/', '\\')
+                    else:
+                        # Use wslpath to convert
+                        result = subprocess.run(['wslpath', '-w', file_path], capture_output=True, text=True)
+                        windows_path = result.stdout.strip()
+
+                    # Open with Windows default browser
+                    subprocess.run(['cmd.exe', '/c', 'start', windows_path], stderr=subprocess.DEVNULL)
+                    return
             except:
                 pass
 
@@ -1130,7 +1471,9 @@ For more information, see the README.md file.
         # If --system flag, show system info and exit
         if args.system:
             logger.info("Gathering system information...")
-            system_info = tools.get_system_info()
+            # print_system_info only shows Plex and basic host details, so skip
+            # sampling local hardware stats that would never be displayed
+            system_info = tools.get_system_info(include_local_stats=False, max_workers=args.workers)
             tools.print_system_info(system_info)
             return
 
@@ -1147,27 +1490,28 @@ For more information, see the README.md file.
             print(f"VIDEO QUALITY ANALYSIS - {args.library}")
             print("=" * 80)
 
-            print(f"\nTotal Items: {quality_stats['total_items']:,}")
+            total_items = quality_stats['total_items']
+            print(f"\nTotal Items: {total_items:,}")
 
             print("\n" + "-" * 80)
             print("RESOLUTION DISTRIBUTION")
             print("-" * 80)
-            for res, count in sorted(quality_stats['resolutions'].items(), key=lambda x: x[1], reverse=True):
-                percentage = (count / quality_stats['total_items'] * 100) if quality_stats['total_items'] > 0 else 0
+            for res, count in quality_stats['resolutions'].most_common():
+                percentage = count / total_items * 100
                 print(f"{res:15s}: {count:5,} ({percentage:5.1f}%)")
 
             print("\n" + "-" * 80)
             print("VIDEO CODEC DISTRIBUTION")
             print("-" * 80)
-            for codec, count in sorted(quality_stats['video_codecs'].items(), key=lambda x: x[1], reverse=True):
-                percentage = (count / quality_stats['total_items'] * 100) if quality_stats['total_items'] > 0 else 0
+            for codec, count in quality_stats['video_codecs'].most_common():
+                percentage = count / total_items * 100
                 print(f"{codec:15s}: {count:5,} ({percentage:5.1f}%)")
 
             print("\n" + "-" * 80)
             print("AUDIO CODEC DISTRIBUTION")
             print("-" * 80)
-            for codec, count in sorted(quality_stats['audio_codecs'].items(), key=lambda x: x[1], reverse=True):
-                percentage = (count / quality_stats['total_items'] * 100) if quality_stats['total_items'] > 0 else 0
+            for codec, count in quality_stats['audio_codecs'].most_common():
+                percentage = count / total_items * 100
                 print(f"{codec:15s}: {count:5,} ({percentage:5.1f}%)")
 
             print("\n" + "=" * 80)
@@ -1214,21 +1558,21 @@ For more information, see the README.md file.
                 print("\n" + "-" * 80)
                 print("BY YEAR (Top 10)")
                 print("-" * 80)
-                for year, count in sorted(stats['by_year'].items(), key=lambda x: x[1], reverse=True)[:10]:
+                for year, count in stats['by_year'].most_common(10):
                     print(f"{year}: {count:,}")
 
             if stats['by_genre']:
                 print("\n" + "-" * 80)
                 print("BY GENRE (Top 10)")
                 print("-" * 80)
-                for genre, count in sorted(stats['by_genre'].items(), key=lambda x: x[1], reverse=True)[:10]:
+                for genre, count in stats['by_genre'].most_common(10):
                     print(f"{genre:25s}: {count:,}")
 
             if stats['by_rating']:
                 print("\n" + "-" * 80)
                 print("BY CONTENT RATING")
                 print("-" * 80)
-                for rating, count in sorted(stats['by_rating'].items(), key=lambda x: x[1], reverse=True):
+                for rating, count in stats['by_rating'].most_common():
                     print(f"{rating:15s}: {count:,}")
 
             print("\n" + "=" * 80)
@@ -1323,10 +1667,15 @@ For more information, see the README.md file.
             print("=" * 80)
 
             sections = tools.plex.library.sections()
-            for section in sections:
+
+            # totalSize is a separate request per section, fetch them concurrently
+            with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+                sizes = list(executor.map(lambda section: section.totalSize, sections))
+
+            for section, size in zip(sections, sizes):
                 print(f"\n{section.title}")
                 print(f"  Type: {section.type}")
-                print(f"  Items: {len(section.all())}")
+                print(f"  Items: {size}")
 
             print("\n" + "=" * 80)
             print("\nTo analyze a library, run:")
@@ -1341,15 +1690,13 @@ For more information, see the README.md file.
         # Get library items with subtitle details
         library_items = tools.list_library(
             library_name=args.library,
-            media_type=args.type
+            media_type=args.type,
+            missing_only=args.list_missing
         )
 
-        # Filter for missing only if requested
-        if args.list_missing:
-            library_items = [item for item in library_items if not item['has_subtitles']]
-            if not library_items:
-                print("\n✓ All items in the library have subtitles!\n")
-                return
+        if args.list_missing and not library_items:
+            print("\n✓ All items in the library have subtitles!\n")
+            return
 
         # Print to console
         tools.print_library_list(library_items)
@@ -1366,6 +1713,8 @@ For more information, see the README.md file.
             import traceback
             traceback.print_exc()
         sys.exit(1)
+    finally:
+        session.close()
 
 
 if __name__ == '__main__':